@@ -1,14 +1,21 @@
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
+from itertools import repeat
+import sys
+
 from bigtree import (
     Node,
-    find_name,
-    find_names,
-    find_attrs,
-    shift_nodes,
     preorder_iter,
 )
 import pandas as pd
 import yaml
 
+# Use the libyaml based loader when PyYAML was built with it, it is several times faster than the pure Python one
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 # Each resulting load combination shall be a dictionary with the following structure:
 # {
 #     "name": str,
@@ -23,25 +30,106 @@ import yaml
 
 def get_promoted_path(self, levels=1, separator="/"):
 
-    # Get promoted path by breaking up the node path into a list and removing the pre-last n item
+    # Get promoted path by walking up the parent pointers, skipping the n nearest ancestors
 
     # Check that the levels is positive and less than the depth of the node
     if levels < 0 or levels >= self.depth:
         raise ValueError("Levels must be positive and less than the depth of the node")
 
-    path = self.path_name.split(separator)
-    path = path[: -levels - 1]
-    path.append(self.name)
-    promoted_path = separator.join(path)
+    ancestor = self
+    for _ in range(levels + 1):
+        ancestor = ancestor.parent
+
+    # Collect the names from the node up to the root, the empty name results in the leading separator
+    names = [self.name]
+    while ancestor is not None:
+        names.append(ancestor.name)
+        ancestor = ancestor.parent
+    names.append("")
+    promoted_path = separator.join(reversed(names))
     return promoted_path
 
 
 # Add the get_promoted_path method to the existing Node class
 Node.get_promoted_path = get_promoted_path
 
+# Subgroup key of a load group, or of the load factor of a load group, that has no subgroups
+_NO_SUBGROUP = object()
+
+
+def _normalize_load_groups(load_groups):
+    """
+    Brings the load groups into the single shape {group_name: {subgroup_name: [item_names]}}.
+
+    A load group given as a list of load items becomes a group with the single subgroup _NO_SUBGROUP.
+
+    Args:
+        load_groups (dict): A dictionary containing the load groups.
+
+    Returns:
+        dict: The normalized load groups.
+
+    Raises:
+        ValueError: If a load group or subgroup does not have the expected structure.
+    """
+    normalized_load_groups = {}
+    for group_name, group_data in load_groups.items():
+        if isinstance(group_data, list):
+            group_data = {_NO_SUBGROUP: group_data}
+        elif not isinstance(group_data, dict):
+            raise ValueError(
+                f"Load group {group_name} must be a list of load items or a dictionary of subgroups"
+            )
+        for subgroup_name, subgroup_data in group_data.items():
+            if not isinstance(subgroup_data, list):
+                raise ValueError(
+                    f"Subgroup {subgroup_name} of load group {group_name} must be a list of load items"
+                )
+        normalized_load_groups[group_name] = group_data
+    return normalized_load_groups
+
+
+def _normalize_load_factors(load_factors):
+    """
+    Brings the load factors into the single shape {combination_name: {group_name: {subgroup_name: load_factor}}}.
+
+    A load factor given for a whole load group becomes the load factor of the subgroup _NO_SUBGROUP.
+
+    Args:
+        load_factors (dict): A dictionary containing the load factors for each load combination.
+
+    Returns:
+        dict: The normalized load factors.
+
+    Raises:
+        ValueError: If a load combination does not have the expected structure.
+    """
+    normalized_load_factors = {}
+    for load_combination_name, load_combination_data in load_factors.items():
+        if not isinstance(load_combination_data, dict):
+            raise ValueError(
+                f"Load combination {load_combination_name} must be a dictionary of load factors"
+            )
+        normalized_load_factors[load_combination_name] = {
+            group_name: (
+                group_data
+                if isinstance(group_data, dict)
+                else {_NO_SUBGROUP: group_data}
+            )
+            for group_name, group_data in load_combination_data.items()
+        }
+    return normalized_load_factors
+
 
 class LoadItem(Node):
+    # Tag checked instead of isinstance in the loops over all nodes, other nodes fall back to the getattr default
+    _is_load_item = True
+
     def __init__(self, name, additive=None):
+        # The same load case names are parsed in several load groups, interning them lets every node of every
+        # load combination share one string object
+        if isinstance(name, str):
+            name = sys.intern(name)
         super().__init__(name)
         if additive is not None:
             self.set_attrs({"additive": additive})
@@ -63,24 +151,23 @@ class LoadItem(Node):
             raise ValueError("Cannot set load factor if not part of LoadCombinationSet")
 
     def get_load_factor(self):
-            """
-            Retrieves the load factor of the current LoadItem.
-
-            If the load factor is explicitly set for the current LoadItem, it is returned.
-            If the load factor is not set for the current LoadItem, but the parent LoadItem exists and is an instance of LoadItem class,
-            the load factor is retrieved from the parent LoadItem recursively.
-            If neither the current LoadItem nor its parent has a load factor set, None is returned.
-
-            Returns:
-                The load factor of the current LoadItem, or None if not set.
-            """
-            load_factor = self.get_attr("load_factor")
+        """
+        Retrieves the load factor of the current LoadItem.
+
+        If the load factor is explicitly set for the current LoadItem, it is returned.
+        If the load factor is not set for the current LoadItem, it is inherited from the closest LoadItem ancestor
+        that has a load factor set. If none of the LoadItem ancestors has a load factor set, None is returned.
+
+        Returns:
+            The load factor of the current LoadItem, or None if not set.
+        """
+        node = self
+        while getattr(node, "_is_load_item", False):
+            load_factor = node._get_set_attr("load_factor")
             if load_factor is not None:
                 return load_factor
-            elif self.parent is not None and isinstance(self.parent, LoadItem):
-                return self.parent.get_load_factor()
-            else:
-                return None
+            node = node.parent
+        return None
 
     def check_root_is_combination_set(self):
         """
@@ -101,14 +188,35 @@ class LoadItem(Node):
         Returns:
             bool: True if any child has load factors defined, False otherwise.
         """
+        # A LoadItem child without its own load factor inherits the one of this LoadItem, so the parent chain
+        # is resolved once instead of once per child
+        load_factor = self.get_load_factor()
         for child in self.children:
-            if isinstance(child, LoadItem):
-                if child.get_load_factor() is not None:
+            if getattr(child, "_is_load_item", False):
+                if (
+                    load_factor is not None
+                    or child._get_set_attr("load_factor") is not None
+                ):
                     return True
         return False
 
     def is_additive(self):
-        return self.get_attr("additive")
+        return self._get_set_attr("additive")
+
+    def _get_set_attr(self, attr_name):
+        """
+        Reads an attribute set with set_attrs, or None if it is not set.
+
+        set_attrs stores the attributes in the node's __dict__, reading it directly skips the generic get_attr
+        resolver. An attribute that was never set stays absent, so show() only displays the ones that are set.
+
+        Args:
+            attr_name (str): The name of the attribute.
+
+        Returns:
+            The value of the attribute, or None if not set.
+        """
+        return self.__dict__.get(attr_name)
 
     @classmethod
     def create_tree(cls, load_groups):
@@ -120,48 +228,396 @@ class LoadItem(Node):
 
         Returns:
             LoadItem: The root node of the created tree hierarchy.
+
+        Raises:
+            ValueError: If the load groups do not have the expected structure.
         """
         load_group_hierarchy = cls("Root")
-        for group_name, group_data in load_groups.items():
-            if isinstance(group_data, dict):
-                group = cls(group_name, additive=False)
-                load_group_hierarchy.append(group)
-                for subgroup_name, subgroup_data in group_data.items():
-                    subgroup_extended_name = f"{group_name}_{subgroup_name}"
-                    subgroup = cls(subgroup_extended_name, additive=True)
+        # The leaves are indexed by name while they are created, in preorder
+        leaf_index = {}
+        for group_name, subgroups in _normalize_load_groups(load_groups).items():
+            # Only a load group with subgroups branches off, a plain list of load items is additive
+            group = cls(group_name, additive=_NO_SUBGROUP in subgroups)
+            load_group_hierarchy.append(group)
+            for subgroup_name, item_names in subgroups.items():
+                subgroup = group
+                if subgroup_name is not _NO_SUBGROUP:
+                    subgroup = cls(f"{group_name}_{subgroup_name}", additive=True)
                     group.append(subgroup)
-                    for item_name in subgroup_data:
-                        item = cls(item_name)
-                        subgroup.append(item)
-            else:
-                group = cls(group_name, additive=True)
-                load_group_hierarchy.append(group)
-                for item_name in group_data:
+                if not item_names:
+                    leaf_index.setdefault(subgroup.node_name, []).append(subgroup)
+                for item_name in item_names:
                     item = cls(item_name)
-                    group.append(item)
+                    subgroup.append(item)
+                    leaf_index.setdefault(item_name, []).append(item)
 
-        # Go through the hierarchy and determine child/parent relationships by checking if the
-        # name of the group matches the name of a leaf item
+        # Determine child/parent relationships by checking if the name of a group matches the name of a leaf
+        # item. The group takes the place of the leaf under its parent, moving a group only removes the leaf it
+        # replaces, so the index stays valid for the remaining groups.
         for group in load_group_hierarchy.children:
-            matching_nodes = find_names(load_group_hierarchy, group.name)
-            for node in matching_nodes:
-                if node.is_leaf:
-                    shift_nodes(
-                        load_group_hierarchy,
-                        [group.path_name],
-                        [node.path_name],
-                        overriding=True,
-                    )
+            for node in leaf_index.get(group.node_name, ()):
+                if node is not group:
+                    parent = node.parent
+                    node.parent = None
+                    group.parent = parent
         return load_group_hierarchy
 
 
+class LoadForest:
+    """
+    Flat snapshot of a load tree, stored as parallel lists indexed by node id.
+
+    Node ids are assigned in preorder, so the root has id 0 and every parent has a lower id than its children.
+    The lists hold plain Python objects, as every access from the traversals is a single scalar lookup.
+    """
+
+    def __init__(self, tree):
+        """
+        Args:
+            tree (Node): The root of the tree to take the snapshot of.
+        """
+        self.nodes = []
+        self.names = []
+        self.parent_ids = []
+        self.child_ids = []
+        self.is_load_item = []
+        self.additive = []
+        self.load_factors = []
+
+        node_ids = {}
+        for node in preorder_iter(tree):
+            node_id = len(self.nodes)
+            node_ids[node] = node_id
+            if node is tree:
+                parent_id = -1
+            else:
+                parent_id = node_ids[node.parent]
+                self.child_ids[parent_id].append(node_id)
+            is_load_item = getattr(node, "_is_load_item", False)
+
+            self.nodes.append(node)
+            self.names.append(node.node_name)
+            self.parent_ids.append(parent_id)
+            self.child_ids.append([])
+            self.is_load_item.append(is_load_item)
+            self.additive.append(node.is_additive() if is_load_item else None)
+            self.load_factors.append(
+                node._get_set_attr("load_factor") if is_load_item else None
+            )
+
+        # The nodes that branch off into one load combination per child
+        self.non_additive_node_ids = [
+            node_id
+            for node_id, additive in enumerate(self.additive)
+            if additive is False
+        ]
+
+        # The descendants of a node are the ids from the node up to the end of its subtree
+        self.subtree_ends = [node_id + 1 for node_id in range(len(self.nodes))]
+        for node_id in reversed(range(len(self.nodes))):
+            child_ids = self.child_ids[node_id]
+            if child_ids:
+                self.subtree_ends[node_id] = self.subtree_ends[child_ids[-1]]
+
+        self.inherited_load_factors = [None] * len(self.nodes)
+        self.resolve_load_factors()
+
+        self._name_index = None
+
+    @property
+    def name_index(self):
+        """
+        dict: The ids of the nodes below the root keyed by name, built on first use and shared with the views.
+        """
+        if self._name_index is None:
+            self._name_index = {
+                name: node_id for node_id, name in enumerate(self.names) if node_id > 0
+            }
+        return self._name_index
+
+    def with_load_factors(self, load_factors):
+        """
+        Creates a view of the forest with additional load factors set.
+
+        The view shares the structure of the forest and only has its own load factor lists, so that a single load
+        group template can be used for every load combination without copying any nodes. Only the subtrees below
+        the new load factors inherit differently, so only those are resolved again.
+
+        Args:
+            load_factors (dict): The load factors to set, keyed by node id.
+
+        Returns:
+            LoadForest: The view with the load factors set.
+        """
+        load_forest = copy(self)
+        load_forest.load_factors = list(self.load_factors)
+        load_forest.inherited_load_factors = list(self.inherited_load_factors)
+        for node_id, load_factor in load_factors.items():
+            load_forest.load_factors[node_id] = load_factor
+
+        subtree_end = 0
+        for node_id in sorted(load_factors):
+            # A subtree nested in one that was just resolved is already up to date
+            if node_id >= subtree_end:
+                subtree_end = self.subtree_ends[node_id]
+                load_forest.resolve_load_factors(node_id, subtree_end)
+        return load_forest
+
+    def resolve_load_factors(self, start=0, end=None):
+        """
+        Resolves the load factors of a range of nodes, inheriting them from the closest LoadItem ancestor that
+        has one. The ancestors of the first node must already be resolved.
+
+        Args:
+            start (int, optional): The id of the first node to resolve. Defaults to the root.
+            end (int, optional): The id after the last node to resolve. Defaults to the end of the forest.
+        """
+        inherited_load_factors = self.inherited_load_factors
+        for node_id in range(start, len(self.nodes) if end is None else end):
+            load_factor = self.load_factors[node_id]
+            parent_id = self.parent_ids[node_id]
+            if load_factor is None and parent_id >= 0 and self.is_load_item[node_id]:
+                load_factor = inherited_load_factors[parent_id]
+            inherited_load_factors[node_id] = load_factor
+
+    def get_used_node_ids(self):
+        """
+        Lists the nodes that are kept when the tree is cleaned.
+
+        A LoadItem is used if it has a load factor, either set or inherited, or if any of its descendants has a
+        load factor set. Whether a load factor is set below a node is aggregated for all nodes in one bottom-up
+        pass, so that the decision for each node is local. The root is always used.
+
+        Returns:
+            list: The ids of the used nodes in preorder.
+        """
+        has_load_factor_below = [False] * len(self.nodes)
+        for node_id in reversed(range(1, len(self.nodes))):
+            if has_load_factor_below[node_id] or self.load_factors[node_id] is not None:
+                has_load_factor_below[self.parent_ids[node_id]] = True
+
+        is_used = [False] * len(self.nodes)
+        used_node_ids = []
+        for node_id, parent_id in enumerate(self.parent_ids):
+            if parent_id >= 0:
+                if not is_used[parent_id]:
+                    continue
+                if (
+                    self.is_load_item[node_id]
+                    and self.inherited_load_factors[node_id] is None
+                    and not has_load_factor_below[node_id]
+                ):
+                    continue
+            is_used[node_id] = True
+            used_node_ids.append(node_id)
+        return used_node_ids
+
+    def get_selections(self, node_ids=None):
+        """
+        Enumerates the ways the non-additive nodes of the tree can be resolved.
+
+        A non-additive node is replaced by one of its children, any other node keeps all of its children, so a
+        selection is fixed by the child chosen at each non-additive node that is reached. The selections are
+        produced one at a time by counting through these choices like an odometer: the choices are ordered by the
+        preorder of their nodes and the last one changes fastest. Only the current choices are kept in memory.
+
+        A child that cannot be resolved, because a non-additive node below it has no children left, is never
+        chosen. If the tree cannot be resolved at all, there are no selections.
+
+        Args:
+            node_ids (list, optional): The ids of the nodes to resolve in preorder, as returned by
+                get_used_node_ids. Defaults to all nodes.
+
+        Yields:
+            tuple: A (child_names, node_ids) tuple, where child_names are the names of the selected children and
+            node_ids are the ids of the nodes that remain, both in preorder.
+        """
+        if node_ids is None:
+            node_ids = range(len(self.nodes))
+        is_selectable = [False] * len(self.nodes)
+        for node_id in node_ids:
+            is_selectable[node_id] = True
+
+        # Without any non-additive node to resolve, all nodes remain in a single selection
+        if not any(is_selectable[node_id] for node_id in self.non_additive_node_ids):
+            yield [], list(node_ids)
+            return
+
+        # The children each node can keep, found bottom-up in reverse preorder
+        selectable_child_ids = [None] * len(self.nodes)
+        is_resolvable = [False] * len(self.nodes)
+        for node_id in reversed(node_ids):
+            child_ids = [
+                child_id
+                for child_id in self.child_ids[node_id]
+                if is_selectable[child_id]
+            ]
+            if self.additive[node_id] is False:
+                child_ids = [
+                    child_id for child_id in child_ids if is_resolvable[child_id]
+                ]
+                is_resolvable[node_id] = bool(child_ids)
+            else:
+                is_resolvable[node_id] = all(
+                    is_resolvable[child_id] for child_id in child_ids
+                )
+            selectable_child_ids[node_id] = child_ids
+
+        root_id = node_ids[0]
+        if not is_resolvable[root_id]:
+            return
+
+        choices = [0] * len(self.nodes)
+        while True:
+            # Walk the tree in preorder, descending only into the chosen child of each non-additive node
+            child_names = []
+            selected_node_ids = []
+            choice_node_ids = []
+            stack = [root_id]
+            while stack:
+                node_id = stack.pop()
+                child_ids = selectable_child_ids[node_id]
+                if self.additive[node_id] is False:
+                    choice_node_ids.append(node_id)
+                    child_id = child_ids[choices[node_id]]
+                    child_names.append(self.names[child_id])
+                    stack.append(child_id)
+                else:
+                    selected_node_ids.append(node_id)
+                    stack.extend(reversed(child_ids))
+            yield child_names, selected_node_ids
+
+            # Advance the last choice that has children left, the choices after it start over. Choices below a
+            # node that is no longer chosen are always back at their first child.
+            for node_id in reversed(choice_node_ids):
+                choices[node_id] += 1
+                if choices[node_id] < len(selectable_child_ids[node_id]):
+                    break
+                choices[node_id] = 0
+            else:
+                return
+
+    def get_load_cases(self, node_ids):
+        """
+        Lists the load cases of a selection of nodes with their load factors.
+
+        The load cases are the selected LoadItems without any selected descendant. Their load factors are the
+        resolved ones, which are the same as those of the leaves of the tree build_tree creates from the
+        selection. The first node is never a load case, as it is replaced by the new root, so a selection of
+        only that node has no load cases.
+
+        Args:
+            node_ids (list): The ids of the selected nodes in preorder.
+
+        Returns:
+            list: A list of (load_case_name, load_factor) tuples in preorder.
+        """
+        load_cases = []
+        for index, node_id in enumerate(node_ids[1:], 1):
+            # In preorder, a node has a selected descendant exactly if the next selected node is in its subtree
+            next_index = index + 1
+            if (
+                next_index < len(node_ids)
+                and node_ids[next_index] < self.subtree_ends[node_id]
+            ):
+                continue
+            if self.is_load_item[node_id]:
+                load_cases.append(
+                    (self.names[node_id], self.inherited_load_factors[node_id])
+                )
+        return load_cases
+
+    def build_tree(self, root, node_ids):
+        """
+        Recreates a selection of nodes below a new root.
+
+        Each node is attached to its closest selected ancestor. A node promoted over a non-additive node keeps
+        the load factor it inherited from it.
+
+        Args:
+            root (Node): The new root, taking the place of the first node id.
+            node_ids (list): The ids of the selected nodes in preorder.
+
+        Returns:
+            Node: The new root.
+        """
+        new_nodes = {node_ids[0]: root}
+        for node_id in node_ids[1:]:
+            parent_id = self.parent_ids[node_id]
+            is_promoted = parent_id not in new_nodes
+            while parent_id not in new_nodes:
+                parent_id = self.parent_ids[parent_id]
+
+            node = self.nodes[node_id]
+            new_node = node.__class__(
+                self.names[node_id], additive=self.additive[node_id]
+            )
+            new_node.parent = new_nodes[parent_id]
+            if is_promoted:
+                load_factor = self.inherited_load_factors[node_id]
+            else:
+                load_factor = self.load_factors[node_id]
+            if load_factor is not None:
+                new_node.set_load_factor(load_factor)
+            new_nodes[node_id] = new_node
+        return root
+
+
+def _get_load_factor_overrides(load_group_forest, load_factors):
+    """
+    Looks up the nodes the load factors of each load combination are assigned to.
+
+    Args:
+        load_group_forest (LoadForest): The flat snapshot of the load group tree.
+        load_factors (dict): A dictionary containing the load factors for each load combination.
+
+    Returns:
+        dict: The load factors of each load combination, keyed by node id.
+
+    Raises:
+        ValueError: If the load factors do not have the expected structure or refer to a subgroup that does not
+            exist.
+    """
+    name_index = load_group_forest.name_index
+
+    load_factor_overrides_by_combination = {}
+    for load_combination_name, load_combination_data in _normalize_load_factors(
+        load_factors
+    ).items():
+        load_factor_overrides = {}
+        for group_name, subgroup_factors in load_combination_data.items():
+            for subgroup_name, load_factor in subgroup_factors.items():
+                # Load factors of unknown load groups are ignored, subgroups must exist
+                if subgroup_name is _NO_SUBGROUP:
+                    if group_name in name_index:
+                        load_factor_overrides[name_index[group_name]] = load_factor
+                else:
+                    subgroup_extended_name = f"{group_name}_{subgroup_name}"
+                    if subgroup_extended_name not in name_index:
+                        raise ValueError(
+                            f"Load combination {load_combination_name} refers to subgroup {subgroup_name} of load group {group_name}, which does not exist"
+                        )
+                    load_factor_overrides[name_index[subgroup_extended_name]] = (
+                        load_factor
+                    )
+        load_factor_overrides_by_combination[load_combination_name] = (
+            load_factor_overrides
+        )
+    return load_factor_overrides_by_combination
+
+
 class LoadCombinationSet(Node):
     def __init__(self, name):
         super().__init__(name)
 
     @classmethod
     def create_tree_sets(
-        cls, load_group_tree, load_factors, clean_tree=True, expand_tree=False
+        cls,
+        load_group_tree,
+        load_factors,
+        clean_tree=True,
+        expand_tree=False,
+        n_jobs=1,
     ):
         """
         Create a new tree structure that contains the load combinations and load factors.
@@ -173,49 +629,109 @@ class LoadCombinationSet(Node):
             clean_tree (bool, optional): Flag indicating whether to clean the tree after assigning load factors.
                 Defaults to True.
             expand_tree (bool, optional): Flag indicating whether to expand the tree after assigning load factors.
+            n_jobs (int, optional): Number of processes used to create the load combinations. Defaults to 1, which
+                creates them in the current process. -1 uses one process per CPU.
 
         Returns:
             dict: A dictionary containing the load combination sets, where the keys are the load combination names
             and the values are the corresponding load combination trees.
-        """
-        load_combination_sets = {}
 
-        for load_combination_name, load_combination_data in load_factors.items():
-            load_combination_tree = cls(load_combination_name)
-
-            # clone the load_group_tree into the load_combination_tree under the load_combination node
-            load_combination_tree.extend(load_group_tree.copy())
+        Raises:
+            ValueError: If the load factors do not have the expected structure, refer to a subgroup that does not
+                exist, or n_jobs is not valid.
+        """
+        if n_jobs == 0 or n_jobs < -1:
+            raise ValueError("n_jobs must be a positive number of processes or -1")
+
+        # The load group tree is only read, every load combination is a view of its flat snapshot with the
+        # load factors of that combination
+        load_group_forest = LoadForest(load_group_tree)
+        load_factor_overrides_by_combination = _get_load_factor_overrides(
+            load_group_forest, load_factors
+        )
+        load_combination_names = list(load_factor_overrides_by_combination)
+        load_factor_overrides_list = list(load_factor_overrides_by_combination.values())
+
+        if n_jobs == 1:
+            tree_dicts = map(
+                cls._create_tree_set,
+                repeat(load_group_forest),
+                load_combination_names,
+                load_factor_overrides_list,
+                repeat(clean_tree),
+                repeat(expand_tree),
+            )
+        else:
+            # The load combinations are independent of each other, every worker process snapshots the load group
+            # tree once and the created trees are sent back in order
+            with ProcessPoolExecutor(
+                max_workers=None if n_jobs == -1 else n_jobs,
+                initializer=_init_tree_set_worker,
+                initargs=(load_group_tree,),
+            ) as executor:
+                tree_dicts = list(
+                    executor.map(
+                        _create_tree_set_in_worker,
+                        repeat(cls),
+                        load_combination_names,
+                        load_factor_overrides_list,
+                        repeat(clean_tree),
+                        repeat(expand_tree),
+                    )
+                )
 
-            for group_name, group_data in load_combination_data.items():
-                if isinstance(group_data, dict):
-                    for subgroup_name, subgroup_data in group_data.items():
-                        subgroup_extended_name = f"{group_name}_{subgroup_name}"
-                        subgroup: LoadItem = find_name(
-                            load_combination_tree, subgroup_extended_name
-                        )
-                        subgroup.set_load_factor(subgroup_data)
-                else:
-                    group: LoadItem = find_name(load_combination_tree, group_name)
-                    if group is not None:
-                        group.set_load_factor(group_data)
+        load_combination_sets = {}
+        for tree_dict in tree_dicts:
+            load_combination_sets.update(tree_dict)
+        return load_combination_sets
 
-            if clean_tree:
-                load_combination_tree.clean_tree()
+    @classmethod
+    def _create_tree_set(
+        cls,
+        load_group_forest,
+        load_combination_name,
+        load_factor_overrides,
+        clean_tree,
+        expand_tree,
+    ):
+        """
+        Create the load combination trees of a single load combination.
 
-            tree_dict = {load_combination_name: load_combination_tree}
+        Args:
+            cls (class): The class used to create the load combination tree.
+            load_group_forest (LoadForest): The flat snapshot of the load group tree.
+            load_combination_name (str): The name of the load combination.
+            load_factor_overrides (dict): The load factors of the load combination by node id.
+            clean_tree (bool): Flag indicating whether to clean the tree after assigning load factors.
+            expand_tree (bool): Flag indicating whether to expand the tree after assigning load factors.
 
-            if expand_tree:
-                tree_dict = load_combination_tree.expand_nonadditive_nodes()
+        Returns:
+            dict: A dictionary containing the load combination trees by name.
+        """
+        load_combination_forest = load_group_forest.with_load_factors(
+            load_factor_overrides
+        )
+
+        # Only the nodes that remain after cleaning are created, the root of the load group tree is replaced
+        # by the load combination node
+        if clean_tree:
+            node_ids = load_combination_forest.get_used_node_ids()
+        else:
+            node_ids = list(range(len(load_combination_forest.nodes)))
+        load_combination_tree = cls(load_combination_name)
+        load_combination_forest.build_tree(load_combination_tree, node_ids)
 
-            load_combination_sets.update(tree_dict)
-        return load_combination_sets
+        if expand_tree:
+            return load_combination_tree.expand_nonadditive_nodes()
+        return {load_combination_name: load_combination_tree}
 
     def clean_tree(self):
         """
         Removes all nodes that do not have a load factor assigned.
 
-        This method iterates over the tree in a preorder traversal and removes any nodes that are instances of `LoadItem`
-        and do not have a child load factor assigned and do not have a load factor assigned themselves.
+        The nodes to keep are determined on a flat LoadForest snapshot of the tree: any `LoadItem` that does not
+        have a load factor assigned and has no load factor assigned anywhere below it is removed together with its
+        descendants, by detaching it from its parent.
 
         Args:
             None
@@ -223,43 +739,35 @@ class LoadCombinationSet(Node):
         Returns:
             None
         """
-        for node in preorder_iter(self):
-            if isinstance(node, LoadItem):
-                if (
-                    node.check_chid_load_factors() is False
-                    and node.get_load_factor() is None
-                ):
-                    shift_nodes(self, [node.path_name], [None], delete_children=True)
+        load_forest = LoadForest(self)
+        used_node_ids = set(load_forest.get_used_node_ids())
+        for node_id, parent_id in enumerate(load_forest.parent_ids):
+            if node_id not in used_node_ids and parent_id in used_node_ids:
+                load_forest.nodes[node_id].parent = None
 
     def expand_nonadditive_nodes(self):
         """
-        Recursively expands non-additive nodes in the tree.
+        Expands non-additive nodes in the tree.
+
+        Each selection of one child per non-additive node results in a new load combination set, in which the
+        non-additive nodes are replaced by their selected children. The selections are enumerated on a flat
+        LoadForest snapshot of the tree and only the nodes that survive a selection are created.
 
         Returns:
             dict: A dictionary containing the load combination sets.
         """
-        load_combination_sets = {}
-        branching_nodes = find_attrs(self, "additive", False)
-        if branching_nodes == ():
-            load_combination_sets[self.root.name] = self
+        load_forest = LoadForest(self)
+        if not load_forest.non_additive_node_ids:
             self.root.set_attrs({"expanded": True})
-        else:
-            node = branching_nodes[0]
-            if len(node.children) > 1:
-                for child in node.children:
-                    partially_expanded_tree = self.copy()
-                    new_child_path = child.get_promoted_path(levels=1)
-                    shift_nodes(
-                        partially_expanded_tree,
-                        [child.path_name, node.path_name],
-                        [new_child_path, None],
-                    )
-                    partially_expanded_tree.root.name = f"{self.name}-{child.name}"
-                    fully_expanded_tree = (
-                        partially_expanded_tree.expand_nonadditive_nodes()
-                    )
-                    load_combination_sets.update(fully_expanded_tree)
+            return {self.root.name: self}
 
+        load_combination_sets = {}
+        for child_names, node_ids in load_forest.get_selections():
+            load_combination_name = "-".join([self.name, *child_names])
+            load_combination_tree = self.__class__(load_combination_name)
+            load_combination_tree.set_attrs({"expanded": True})
+            load_forest.build_tree(load_combination_tree, node_ids)
+            load_combination_sets[load_combination_name] = load_combination_tree
         return load_combination_sets
 
     def to_dict(self):
@@ -277,13 +785,38 @@ class LoadCombinationSet(Node):
         if self.get_attr("expanded") is None:
             raise ValueError("Tree must be expanded before converting to dictionary")
 
-        load_case_dict = {}
-        for load_case in self.leaves:
-            load_case_dict[load_case.name] = load_case.get_load_factor()
+        load_case_dict = dict(self._get_load_cases())
 
         combination_dict = {"name": self.name, "load_cases": load_case_dict}
         return combination_dict
 
+    def _get_load_cases(self):
+        """
+        Lists the load cases of the tree with their load factors.
+
+        The load cases are the LoadItem leaves of the tree. Their load factors are resolved in a single preorder
+        pass that hands the inherited load factor down to the children, rather than by walking up the ancestors
+        of every leaf. A tree without any load item has no load cases.
+
+        Returns:
+            list: A list of (load_case_name, load_factor) tuples in preorder.
+        """
+        load_cases = []
+        stack = [(child, None) for child in reversed(self.children)]
+        while stack:
+            node, inherited_load_factor = stack.pop()
+            if not getattr(node, "_is_load_item", False):
+                continue
+            load_factor = node._get_set_attr("load_factor")
+            if load_factor is None:
+                load_factor = inherited_load_factor
+            children = node.children
+            if children:
+                stack.extend((child, load_factor) for child in reversed(children))
+            else:
+                load_cases.append((node.name, load_factor))
+        return load_cases
+
     def to_dataframe(self, df_exist=None):
         """
         Converts the load combination tree to a pandas DataFrame.
@@ -303,12 +836,12 @@ class LoadCombinationSet(Node):
             raise ValueError("Tree must be expanded before converting to dataframe")
 
         data = []
-        for load_case in self.leaves:
+        for load_case_name, load_factor in self._get_load_cases():
             data.append(
                 {
                     "Load Combination": self.name,
-                    "Load Case": load_case.name,
-                    "Load Factor": load_case.get_load_factor(),
+                    "Load Case": load_case_name,
+                    "Load Factor": load_factor,
                 }
             )
         df = pd.DataFrame(data)
@@ -326,14 +859,172 @@ class LoadCombinationSet(Node):
         Args:
             load_combination_sets (dict): A dictionary containing load combination names as keys and load combination trees as values.
             file_path (str, optional): The file path to save the CSV file. Defaults to "load_combinations.csv".
+
+        Raises:
+            ValueError: If any of the trees has not been expanded.
+        """
+        # Collect the rows of all trees as columns and build the DataFrame once, rather than concatenating one
+        # DataFrame per tree
+        load_combination_names = []
+        load_case_names = []
+        load_factors = []
+        for load_combination_tree in load_combination_sets.values():
+            # Check if the tree has been expanded
+            if load_combination_tree.get_attr("expanded") is None:
+                raise ValueError("Tree must be expanded before converting to dataframe")
+
+            load_cases = load_combination_tree._get_load_cases()
+            load_combination_names.extend(
+                repeat(load_combination_tree.name, len(load_cases))
+            )
+            for load_case_name, load_factor in load_cases:
+                load_case_names.append(load_case_name)
+                load_factors.append(load_factor)
+
+        df = pd.DataFrame(
+            {
+                "Load Combination": load_combination_names,
+                "Load Case": load_case_names,
+                "Load Factor": load_factors,
+            }
+        )
+        df.to_csv(file_path, index=False)
+
+    @classmethod
+    def load_factors_to_csv(
+        cls,
+        load_group_tree,
+        load_factors,
+        file_path="load_combinations.csv",
+        clean_tree=True,
+    ):
+        """
+        Write the expanded load combinations of the given load factors to a CSV file.
+
+        The rows are the same as those set_to_csv writes for the trees of create_tree_sets with expand_tree=True,
+        but they are taken directly from the views of the load group tree snapshot, without creating any
+        load combination tree. A load combination whose load factors match none of the load groups has no load
+        cases and writes no rows.
+
+        Args:
+            load_group_tree (Tree): The original load group tree.
+            load_factors (dict): A dictionary containing the load factors for each load combination.
+            file_path (str, optional): The file path to save the CSV file. Defaults to "load_combinations.csv".
+            clean_tree (bool, optional): Flag indicating whether to leave out the nodes without a load factor.
+                Defaults to True.
+
+        Returns:
+            int: The number of load combinations, including those without any rows.
+
+        Raises:
+            ValueError: If the load factors do not have the expected structure or refer to a subgroup that does
+                not exist.
+        """
+        load_combination_count = 0
+        load_combination_names = []
+        load_case_names = []
+        load_factor_values = []
+        for load_combination_name, load_cases in cls._iter_load_cases(
+            load_group_tree, load_factors, clean_tree
+        ):
+            load_combination_count += 1
+            load_combination_names.extend(
+                repeat(load_combination_name, len(load_cases))
+            )
+            for load_case_name, load_factor in load_cases:
+                load_case_names.append(load_case_name)
+                load_factor_values.append(load_factor)
+
+        df = pd.DataFrame(
+            {
+                "Load Combination": load_combination_names,
+                "Load Case": load_case_names,
+                "Load Factor": load_factor_values,
+            }
+        )
+        df.to_csv(file_path, index=False)
+        return load_combination_count
+
+    @classmethod
+    def iter_load_combinations(cls, load_group_tree, load_factors, clean_tree=True):
+        """
+        Iterate over the expanded load combinations of the given load factors as dictionaries.
+
+        Each dictionary is the same as the one to_dict returns for the trees of create_tree_sets with
+        expand_tree=True, but it is taken directly from the views of the load group tree snapshot, without creating
+        any load combination tree. The load combinations are produced one at a time.
+
+        Args:
+            load_group_tree (Tree): The original load group tree.
+            load_factors (dict): A dictionary containing the load factors for each load combination.
+            clean_tree (bool, optional): Flag indicating whether to leave out the nodes without a load factor.
+                Defaults to True.
+
+        Yields:
+            dict: A dictionary with the name of the load combination and its load factors by load case.
+
+        Raises:
+            ValueError: If the load factors do not have the expected structure or refer to a subgroup that does
+                not exist.
+        """
+        for load_combination_name, load_cases in cls._iter_load_cases(
+            load_group_tree, load_factors, clean_tree
+        ):
+            yield {"name": load_combination_name, "load_cases": dict(load_cases)}
+
+    @classmethod
+    def _iter_load_cases(cls, load_group_tree, load_factors, clean_tree):
         """
-        df = None
+        Iterate over the expanded load combinations of the given load factors with their load cases.
+
+        Args:
+            load_group_tree (Tree): The original load group tree.
+            load_factors (dict): A dictionary containing the load factors for each load combination.
+            clean_tree (bool): Flag indicating whether to leave out the nodes without a load factor.
+
+        Yields:
+            tuple: The name of the load combination and a list of (load_case_name, load_factor) tuples.
+        """
+        load_group_forest = LoadForest(load_group_tree)
         for (
             load_combination_name,
-            load_combination_tree,
-        ) in load_combination_sets.items():
-            df = load_combination_tree.to_dataframe(df)
-        df.to_csv(file_path, index=False)
+            load_factor_overrides,
+        ) in _get_load_factor_overrides(load_group_forest, load_factors).items():
+            load_combination_forest = load_group_forest.with_load_factors(
+                load_factor_overrides
+            )
+            if clean_tree:
+                node_ids = load_combination_forest.get_used_node_ids()
+            else:
+                node_ids = list(range(len(load_combination_forest.nodes)))
+
+            for (
+                child_names,
+                selected_node_ids,
+            ) in load_combination_forest.get_selections(node_ids):
+                load_cases = load_combination_forest.get_load_cases(selected_node_ids)
+                yield "-".join([load_combination_name, *child_names]), load_cases
+
+
+# Snapshot of the load group tree in a worker process of LoadCombinationSet.create_tree_sets
+_worker_load_group_forest = None
+
+
+def _init_tree_set_worker(load_group_tree):
+    global _worker_load_group_forest
+    _worker_load_group_forest = LoadForest(load_group_tree)
+
+
+def _create_tree_set_in_worker(
+    cls, load_combination_name, load_factor_overrides, clean_tree, expand_tree
+):
+    return cls._create_tree_set(
+        _worker_load_group_forest,
+        load_combination_name,
+        load_factor_overrides,
+        clean_tree,
+        expand_tree,
+    )
 
 
 if __name__ == "__main__":
@@ -357,12 +1048,12 @@ if __name__ == "__main__":
     # Load the load_groups from the YAML file
     load_groups_filepath = "load_groups.yml"
     with open(load_groups_filepath, "r") as file:
-        load_groups = yaml.safe_load(file)
+        load_groups = yaml.load(file, Loader=SafeLoader)
 
     # Load the load_factors from the YAML file
     load_factors_filepath = "load_factors.yml"
     with open(load_factors_filepath, "r") as file:
-        load_factors = yaml.safe_load(file)
+        load_factors = yaml.load(file, Loader=SafeLoader)
 
     print(
         f"Using load groups from {load_groups_filepath} and load factors from {load_factors_filepath}"
@@ -370,15 +1061,14 @@ if __name__ == "__main__":
 
     load_group_tree = LoadItem.create_tree(load_groups)
 
-    load_combination_sets = LoadCombinationSet.create_tree_sets(
-        load_group_tree, load_factors, clean_tree=True, expand_tree=True
+    # Only the CSV file is needed, so the rows are written without creating the load combination trees
+    csv_file_path = "load_combinations.csv"
+    load_combination_count = LoadCombinationSet.load_factors_to_csv(
+        load_group_tree, load_factors, csv_file_path
     )
 
     # Show the number of combinations created
-    print(f"Number of combinations created: {len(load_combination_sets)}")
-
-    csv_file_path = "load_combinations.csv"
-    LoadCombinationSet.set_to_csv(load_combination_sets, csv_file_path)
+    print(f"Number of combinations created: {load_combination_count}")
     print(f"Load combinations saved to {csv_file_path}")
 
     print("Done")
@@ -0,0 +1,352 @@
+import csv
+import os
+import tempfile
+import unittest
+
+from bigtree import preorder_iter
+import yaml
+
+from main import LoadCombinationSet, LoadItem
+
+EXAMPLE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Expected load combinations of the example load_groups.yml and load_factors.yml
+EXPECTED_LOAD_COMBINATIONS = {
+    "LRFD1": {"DL": 1.4, "SDL": 1.4},
+    "LRFD2-Live_Perm": {"DL": 1.2, "SDL": 1.2, "LL": 1.6},
+    "LRFD2-Live_Construction": {"DL": 1.2, "SDL": 1.2, "LL_Construction": 1.0},
+    "LRFD2-Live_Pattern": {"DL": 1.2, "SDL": 1.2, "LL_Pattern": 1.6},
+    "LRFD4-Live_Perm-Lateral_Wind-Wind_North": {
+        "DL": 1.2,
+        "SDL": 1.2,
+        "LL": 1.0,
+        "WL_Frame_North": 1.0,
+        "WL_Cladding_North": 1.0,
+    },
+    "LRFD4-Live_Perm-Lateral_Wind-Wind_West": {
+        "DL": 1.2,
+        "SDL": 1.2,
+        "LL": 1.0,
+        "WL_Frame_West": 1.0,
+        "WL_Cladding_West": 1.0,
+    },
+    "LRFD4-Live_Pattern-Lateral_Wind-Wind_North": {
+        "DL": 1.2,
+        "SDL": 1.2,
+        "LL_Pattern": 1.0,
+        "WL_Frame_North": 1.0,
+        "WL_Cladding_North": 1.0,
+    },
+    "LRFD4-Live_Pattern-Lateral_Wind-Wind_West": {
+        "DL": 1.2,
+        "SDL": 1.2,
+        "LL_Pattern": 1.0,
+        "WL_Frame_West": 1.0,
+        "WL_Cladding_West": 1.0,
+    },
+    "Lateral-Envelope-Lateral_Wind-Wind_North": {
+        "WL_Frame_North": 1.0,
+        "WL_Cladding_North": 1.0,
+    },
+    "Lateral-Envelope-Lateral_Wind-Wind_West": {
+        "WL_Frame_West": 1.0,
+        "WL_Cladding_West": 1.0,
+    },
+    "Lateral-Envelope-Lateral_Seismic-Seismic_North": {"EQ_North": 1.0},
+    "Lateral-Envelope-Lateral_Seismic-Seismic_West": {"EQ_West": 1.0},
+}
+
+
+def load_example(file_name):
+    with open(os.path.join(EXAMPLE_DIR, file_name), "r") as file:
+        return yaml.safe_load(file)
+
+
+class TestExampleLoadCombinations(unittest.TestCase):
+    def setUp(self):
+        self.load_group_tree = LoadItem.create_tree(load_example("load_groups.yml"))
+        self.load_factors = load_example("load_factors.yml")
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def create_tree_sets(self, clean_tree=True):
+        return LoadCombinationSet.create_tree_sets(
+            self.load_group_tree,
+            self.load_factors,
+            clean_tree=clean_tree,
+            expand_tree=True,
+        )
+
+    def test_expanded_load_combinations(self):
+        load_combination_sets = self.create_tree_sets()
+
+        self.assertEqual(list(load_combination_sets), list(EXPECTED_LOAD_COMBINATIONS))
+        for name, load_combination_tree in load_combination_sets.items():
+            with self.subTest(name=name):
+                self.assertEqual(
+                    load_combination_tree.to_dict(),
+                    {"name": name, "load_cases": EXPECTED_LOAD_COMBINATIONS[name]},
+                )
+
+    def test_nested_load_group_factor_is_kept(self):
+        # Wind only has a load factor in LRFD4 through the Lateral group that references it
+        load_combination_names = [
+            name for name in self.create_tree_sets() if name.startswith("LRFD4")
+        ]
+
+        self.assertEqual(
+            load_combination_names,
+            [
+                "LRFD4-Live_Perm-Lateral_Wind-Wind_North",
+                "LRFD4-Live_Perm-Lateral_Wind-Wind_West",
+                "LRFD4-Live_Pattern-Lateral_Wind-Wind_North",
+                "LRFD4-Live_Pattern-Lateral_Wind-Wind_West",
+            ],
+        )
+
+    def test_promoted_child_inherits_load_factor(self):
+        load_combination_tree = self.create_tree_sets()[
+            "LRFD4-Live_Perm-Lateral_Wind-Wind_North"
+        ]
+        nodes = {node.node_name: node for node in preorder_iter(load_combination_tree)}
+
+        # Lateral_Wind and Wind_North take the places of the non-additive Lateral and Wind groups, Wind_North
+        # keeps the load factor set on Wind
+        self.assertNotIn("Lateral", nodes)
+        self.assertNotIn("Wind", nodes)
+        self.assertIs(nodes["Lateral_Wind"].parent, load_combination_tree)
+        self.assertIs(nodes["Wind_North"].parent, nodes["Lateral_Wind"])
+        self.assertIsNone(nodes["Lateral_Wind"].get_attr("load_factor"))
+        self.assertEqual(nodes["Wind_North"].get_attr("load_factor"), 1.0)
+        self.assertEqual(nodes["WL_Frame_North"].get_load_factor(), 1.0)
+
+    def test_load_factors_to_csv_matches_set_to_csv(self):
+        for clean_tree in (True, False):
+            with self.subTest(clean_tree=clean_tree):
+                tree_file_path = os.path.join(self.temp_dir.name, "trees.csv")
+                direct_file_path = os.path.join(self.temp_dir.name, "direct.csv")
+
+                load_combination_sets = self.create_tree_sets(clean_tree)
+                LoadCombinationSet.set_to_csv(load_combination_sets, tree_file_path)
+                load_combination_count = LoadCombinationSet.load_factors_to_csv(
+                    self.load_group_tree,
+                    self.load_factors,
+                    direct_file_path,
+                    clean_tree=clean_tree,
+                )
+
+                self.assertEqual(load_combination_count, len(load_combination_sets))
+                with open(tree_file_path, "r") as tree_file, open(
+                    direct_file_path, "r"
+                ) as direct_file:
+                    self.assertEqual(direct_file.read(), tree_file.read())
+
+    def test_load_factors_to_csv_rows(self):
+        file_path = os.path.join(self.temp_dir.name, "load_combinations.csv")
+        LoadCombinationSet.load_factors_to_csv(
+            self.load_group_tree, self.load_factors, file_path
+        )
+
+        with open(file_path, "r", newline="") as file:
+            rows = list(csv.DictReader(file))
+
+        expected_rows = [
+            (name, load_case, load_factor)
+            for name, load_cases in EXPECTED_LOAD_COMBINATIONS.items()
+            for load_case, load_factor in load_cases.items()
+        ]
+        self.assertEqual(
+            [
+                (
+                    row["Load Combination"],
+                    row["Load Case"],
+                    float(row["Load Factor"]),
+                )
+                for row in rows
+            ],
+            expected_rows,
+        )
+
+    def test_iter_load_combinations_matches_to_dict(self):
+        for clean_tree in (True, False):
+            with self.subTest(clean_tree=clean_tree):
+                expected = [
+                    load_combination_tree.to_dict()
+                    for load_combination_tree in self.create_tree_sets(
+                        clean_tree
+                    ).values()
+                ]
+
+                self.assertEqual(
+                    list(
+                        LoadCombinationSet.iter_load_combinations(
+                            self.load_group_tree,
+                            self.load_factors,
+                            clean_tree=clean_tree,
+                        )
+                    ),
+                    expected,
+                )
+
+    def test_create_tree_sets_in_worker_processes(self):
+        load_combination_sets = LoadCombinationSet.create_tree_sets(
+            self.load_group_tree, self.load_factors, expand_tree=True, n_jobs=2
+        )
+
+        self.assertEqual(
+            [
+                load_combination_tree.to_dict()
+                for load_combination_tree in load_combination_sets.values()
+            ],
+            [
+                load_combination_tree.to_dict()
+                for load_combination_tree in self.create_tree_sets().values()
+            ],
+        )
+
+    def test_create_tree_sets_rejects_invalid_n_jobs(self):
+        for n_jobs in (0, -2):
+            with self.subTest(n_jobs=n_jobs):
+                with self.assertRaises(ValueError):
+                    LoadCombinationSet.create_tree_sets(
+                        self.load_group_tree, self.load_factors, n_jobs=n_jobs
+                    )
+
+
+class TestLoadCombinations(unittest.TestCase):
+    def setUp(self):
+        self.load_group_tree = LoadItem.create_tree(
+            {"Dead": ["DL", "SDL"], "Live": {"Perm": ["LL"], "Pattern": ["LL_Pattern"]}}
+        )
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def expand(self, load_group_tree, load_factors):
+        load_combinations = [
+            load_combination_tree.to_dict()
+            for load_combination_tree in LoadCombinationSet.create_tree_sets(
+                load_group_tree, load_factors, expand_tree=True
+            ).values()
+        ]
+        self.assertEqual(
+            list(
+                LoadCombinationSet.iter_load_combinations(load_group_tree, load_factors)
+            ),
+            load_combinations,
+        )
+        return load_combinations
+
+    def test_non_additive_group_factor_is_inherited(self):
+        load_combinations = self.expand(self.load_group_tree, {"C": {"Live": 1.6}})
+
+        self.assertEqual(
+            load_combinations,
+            [
+                {"name": "C-Live_Perm", "load_cases": {"LL": 1.6}},
+                {"name": "C-Live_Pattern", "load_cases": {"LL_Pattern": 1.6}},
+            ],
+        )
+
+    def test_non_additive_group_with_single_subgroup(self):
+        load_group_tree = LoadItem.create_tree({"Wind": {"North": ["WL_North"]}})
+
+        load_combinations = self.expand(load_group_tree, {"C": {"Wind": 1.0}})
+
+        self.assertEqual(
+            load_combinations,
+            [{"name": "C-Wind_North", "load_cases": {"WL_North": 1.0}}],
+        )
+
+    def test_load_factors_to_csv_skips_unmatched_combination(self):
+        load_factors = {"Soil-Only": {"Soil": 1.0}, "Dead-Only": {"Dead": 1.4}}
+        file_path = os.path.join(self.temp_dir.name, "load_combinations.csv")
+        tree_file_path = os.path.join(self.temp_dir.name, "trees.csv")
+
+        load_combination_count = LoadCombinationSet.load_factors_to_csv(
+            self.load_group_tree, load_factors, file_path
+        )
+        LoadCombinationSet.set_to_csv(
+            LoadCombinationSet.create_tree_sets(
+                self.load_group_tree, load_factors, expand_tree=True
+            ),
+            tree_file_path,
+        )
+
+        self.assertEqual(load_combination_count, 2)
+        with open(file_path, "r") as file, open(tree_file_path, "r") as tree_file:
+            content = file.read()
+            self.assertEqual(content, tree_file.read())
+        self.assertEqual(
+            content.splitlines(),
+            [
+                "Load Combination,Load Case,Load Factor",
+                "Dead-Only,DL,1.4",
+                "Dead-Only,SDL,1.4",
+            ],
+        )
+
+    def test_iter_load_combinations_unmatched_combination_has_no_load_cases(self):
+        load_factors = {"Soil-Only": {"Soil": 1.0}, "Dead-Only": {"Dead": 1.4}}
+
+        load_combinations = list(
+            LoadCombinationSet.iter_load_combinations(
+                self.load_group_tree, load_factors
+            )
+        )
+
+        self.assertEqual(
+            load_combinations,
+            [
+                {"name": "Soil-Only", "load_cases": {}},
+                {"name": "Dead-Only", "load_cases": {"DL": 1.4, "SDL": 1.4}},
+            ],
+        )
+        self.assertEqual(
+            load_combinations,
+            [
+                load_combination_tree.to_dict()
+                for load_combination_tree in LoadCombinationSet.create_tree_sets(
+                    self.load_group_tree, load_factors, expand_tree=True
+                ).values()
+            ],
+        )
+
+
+class TestInputValidation(unittest.TestCase):
+    def test_invalid_load_groups(self):
+        for load_groups in (
+            {"Dead": "DL"},
+            {"Live": {"Perm": "LL"}},
+        ):
+            with self.subTest(load_groups=load_groups):
+                with self.assertRaises(ValueError):
+                    LoadItem.create_tree(load_groups)
+
+    def test_invalid_load_factors(self):
+        load_group_tree = LoadItem.create_tree({"Live": {"Perm": ["LL"]}})
+
+        for load_factors in (
+            {"C": 1.6},
+            {"C": {"Live": {"Nope": 1.6}}},
+        ):
+            with self.subTest(load_factors=load_factors):
+                with self.assertRaises(ValueError):
+                    LoadCombinationSet.create_tree_sets(load_group_tree, load_factors)
+                with self.assertRaises(ValueError):
+                    list(
+                        LoadCombinationSet.iter_load_combinations(
+                            load_group_tree, load_factors
+                        )
+                    )
+
+    def test_unknown_subgroup_error_names_combination_and_subgroup(self):
+        load_group_tree = LoadItem.create_tree({"Live": {"Perm": ["LL"]}})
+
+        with self.assertRaisesRegex(ValueError, "LRFD2.*Nope.*Live"):
+            LoadCombinationSet.create_tree_sets(
+                load_group_tree, {"LRFD2": {"Live": {"Nope": 1.6}}}
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()